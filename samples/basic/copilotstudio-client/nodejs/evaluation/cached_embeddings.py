@@ -0,0 +1,86 @@
+"""
+Embedding Cache for RAGAS Evaluation
+
+Wraps a langchain Embeddings instance so that vectors are stored in a local
+SQLite file and reused across rows and runs.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from typing import List, Dict, Any
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# SQLite caps the number of bound parameters per statement
+_CACHE_LOOKUP_BATCH = 500
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings proxy that persists vectors in a local SQLite cache.
+    
+    Vectors are keyed by sha256(text|namespace), so unchanged texts are never
+    re-embedded across rows or across runs. The namespace should identify the
+    endpoint, deployment, model and API version that produced the vectors.
+    """
+    
+    def __init__(self, inner: Embeddings, cache_path: str, namespace: str = ""):
+        self.inner = inner
+        self.namespace = namespace
+        self.db = sqlite3.connect(cache_path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB)")
+        self.db.commit()
+        self._lock = threading.Lock()
+    
+    def _hash(self, text: str) -> bytes:
+        return hashlib.sha256(f"{text}|{self.namespace}".encode("utf-8")).digest()
+    
+    def _lookup(self, texts: List[str]):
+        """Return (hashes, cached vectors by hash, uncached texts by hash)."""
+        hashes = [self._hash(text) for text in texts]
+        unique_hashes = list(dict.fromkeys(hashes))
+        found = {}
+        with self._lock:
+            for start in range(0, len(unique_hashes), _CACHE_LOOKUP_BATCH):
+                batch = unique_hashes[start:start + _CACHE_LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.db.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})", batch
+                )
+                for key, vec in rows:
+                    found[key] = np.frombuffer(vec, dtype=np.float32)
+        misses = {}
+        for key, text in zip(hashes, texts):
+            if key not in found:
+                misses.setdefault(key, text)
+        return hashes, found, misses
+    
+    def _store(self, found: Dict[bytes, Any], keys: List[bytes], vectors: List[List[float]]):
+        rows = []
+        for key, vector in zip(keys, vectors):
+            found[key] = np.asarray(vector, dtype=np.float32)
+            rows.append((key, found[key].tobytes()))
+        with self._lock:
+            self.db.executemany("INSERT OR IGNORE INTO embeddings (hash, vec) VALUES (?, ?)", rows)
+            self.db.commit()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, found, misses = self._lookup(texts)
+        if misses:
+            self._store(found, list(misses), self.inner.embed_documents(list(misses.values())))
+        return [found[key].tolist() for key in hashes]
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # SQLite I/O blocks, so keep it off the event loop
+        hashes, found, misses = await asyncio.to_thread(self._lookup, texts)
+        if misses:
+            vectors = await self.inner.aembed_documents(list(misses.values()))
+            await asyncio.to_thread(self._store, found, list(misses), vectors)
+        return [found[key].tolist() for key in hashes]
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
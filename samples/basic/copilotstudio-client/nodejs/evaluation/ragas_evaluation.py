@@ -7,32 +7,74 @@ It reads data from sample_questions_with_answers.csv and computes various evalua
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import numpy as np
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, Tuple
 import os
-from datasets import Dataset
-from ragas import evaluate
-from ragas.metrics import (
-    answer_relevancy,
-    answer_correctness,
-    answer_similarity,
-    context_recall,
-    context_precision,
-    faithfulness
+import argparse
+import logging
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import httpx
+
+# ragas, datasets and langchain take seconds to import, so they are imported
+# inside the functions that need them; --help and input errors stay fast
+if TYPE_CHECKING:
+    from datasets import Dataset
+
+logger = logging.getLogger(__name__)
+
+# Shared connection pool so LLM and embedding calls reuse warm keep-alive connections.
+# Async connections are bound to the event loop that opened them, so the evaluation
+# opens (and closes) its async client with the same options on its own loop
+_HTTP_CLIENT_OPTIONS = dict(
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    http2=True,
+    timeout=60
 )
-from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+_HTTP_CLIENT = httpx.Client(**_HTTP_CLIENT_OPTIONS)
+atexit.register(_HTTP_CLIENT.close)
+
+# Client fields rebuilt when a model is bound to a shard's async HTTP client
+_OPENAI_CLIENT_FIELDS = {"client", "async_client", "root_client", "root_async_client", "http_async_client"}
 
 def load_data(csv_path: str) -> pd.DataFrame:
-    """Load Q&A data from CSV file."""
+    """Load Q&A data from CSV file into Arrow-backed columns."""
     try:
-        df = pd.read_csv(csv_path)
-        print(f"Successfully loaded {len(df)} records from {csv_path}")
+        # Parse with Arrow directly: generated answers often span several lines,
+        # which pandas' pyarrow engine cannot read
+        table = pa_csv.read_csv(csv_path, parse_options=pa_csv.ParseOptions(newlines_in_values=True))
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        logger.info(f"Successfully loaded {len(df)} records from {csv_path}")
         return df
     except Exception as e:
-        print(f"Error loading data: {e}")
+        logger.error(f"Error loading data: {e}")
         return None
 
-def prepare_ragas_dataset(df: pd.DataFrame) -> Dataset:
+def deduplicate_rows(df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Collapse rows with identical question/answer/reference so each is evaluated once.
+    
+    Returns:
+        The unique rows, and for every original row the position of its unique row,
+        so per-row metrics can be scattered back with ``.iloc[row_groups]``.
+    """
+    
+    key_columns = ['question', 'answer', 'reference']
+    row_groups = df.groupby(key_columns, sort=False, dropna=False).ngroup().to_numpy()
+    unique_df = df.drop_duplicates(subset=key_columns).reset_index(drop=True)
+    
+    if len(df):
+        saved = len(df) - len(unique_df)
+        logger.info(f"Deduplicated {len(df)} rows to {len(unique_df)} unique rows "
+                    f"({saved / len(df):.1%} of evaluations skipped)")
+    
+    return unique_df, row_groups
+
+def prepare_ragas_dataset(df: pd.DataFrame) -> "Dataset":
     """
     Prepare dataset for RAGAS evaluation.
     
@@ -43,32 +85,109 @@ def prepare_ragas_dataset(df: pd.DataFrame) -> Dataset:
     - ground_truth: The expected answer (using reference as ground truth)
     """
     
-    # Clean and prepare data
-    questions = df['question'].tolist()
-    answers = df['answer'].tolist()
-    references = df['reference'].tolist()
+    from datasets import Dataset
     
-    # For RAGAS, we need contexts as lists of strings
-    # We'll use the reference as context for evaluation
-    contexts = [[ref] for ref in references]
+    # Keep the Arrow-backed columns as they are instead of copying them into Python lists.
+    # Columns read in several CSV blocks come back chunked; the ListArray below needs
+    # one contiguous values array
+    references = pa.array(df['reference'], type=pa.string())
+    if isinstance(references, pa.ChunkedArray):
+        references = references.combine_chunks()
     
-    # Ground truth is the expected answer (we'll use reference as ground truth)
-    ground_truths = references
+    # For RAGAS, we need contexts as lists of strings. We'll use the reference as the
+    # single context of each row: a ListArray with offsets 0..n over the reference
+    # buffer, rather than n one-element Python lists
+    offsets = pa.array(np.arange(len(references) + 1, dtype=np.int32))
+    contexts = pa.ListArray.from_arrays(offsets, references)
     
-    # Create dataset dictionary
-    dataset_dict = {
-        'question': questions,
-        'answer': answers,
+    # Ground truth is the expected answer (we'll use reference as ground truth)
+    table = pa.table({
+        'question': pa.array(df['question'], type=pa.string()),
+        'answer': pa.array(df['answer'], type=pa.string()),
         'contexts': contexts,
-        'ground_truth': ground_truths
-    }
+        'ground_truth': references
+    })
     
     # Create HuggingFace Dataset
-    dataset = Dataset.from_dict(dataset_dict)
+    dataset = Dataset(table)
     
     return dataset
 
-def evaluate_with_ragas(dataset: Dataset, azure_llm=None, azure_embeddings=None) -> Dict[str, Any]:
+def bind_async_http_client(model, http_async_client: httpx.AsyncClient):
+    """Return a copy of a langchain OpenAI model whose async requests use http_async_client."""
+    
+    if model is None:
+        return None
+    
+    # CachedEmbeddings: share the cache, rebind the wrapped embeddings
+    if hasattr(model, "inner"):
+        bound = copy.copy(model)
+        bound.inner = bind_async_http_client(model.inner, http_async_client)
+        return bound
+    
+    fields = {name: getattr(model, name) for name in model.model_fields_set - _OPENAI_CLIENT_FIELDS}
+    return type(model)(**fields, http_async_client=http_async_client)
+
+async def warm_up_clients(llm, embeddings):
+    """Send one tiny LLM and embedding request concurrently before evaluation starts."""
+    
+    # Go around the embedding cache so the request actually reaches Azure
+    embeddings = getattr(embeddings, "inner", embeddings)
+    
+    results = await asyncio.gather(embeddings.aembed_query("."), llm.ainvoke("."), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning(f"Warning: warm-up request failed: {result}")
+
+def run_sharded_evaluation(dataset: "Dataset", metrics: list, num_shards: int, **evaluate_kwargs) -> pd.DataFrame:
+    """
+    Run ragas.aevaluate over contiguous row shards concurrently.
+    
+    All shards run on one event loop and share one async HTTP client, which is opened
+    and closed on that loop. Per-row scores are concatenated back in the original row
+    order; rows of a shard that failed as a whole are left as NaN.
+    """
+    
+    from ragas import aevaluate
+    
+    num_shards = max(1, min(num_shards, len(dataset)))
+    shards = [dataset.shard(num_shards=num_shards, index=i, contiguous=True) for i in range(num_shards)]
+    
+    async def run_shard(shard, **shard_kwargs):
+        # aevaluate() attaches and later resets the LLM/embeddings on the metric
+        # objects, so each shard needs its own copies
+        shard_metrics = [copy.deepcopy(metric) for metric in metrics]
+        # Rows whose metric calls fail are scored as NaN
+        return await aevaluate(shard, metrics=shard_metrics, **shard_kwargs)
+    
+    async def run_all():
+        async with httpx.AsyncClient(**_HTTP_CLIENT_OPTIONS) as http_async_client:
+            shard_kwargs = dict(evaluate_kwargs)
+            for key in ("llm", "embeddings"):
+                shard_kwargs[key] = bind_async_http_client(shard_kwargs.get(key), http_async_client)
+            if shard_kwargs["llm"] is not None and shard_kwargs["embeddings"] is not None:
+                # Resolve DNS, open TLS sessions on this client and wake the deployments
+                # before RAGAS hits the critical path
+                await warm_up_clients(shard_kwargs["llm"], shard_kwargs["embeddings"])
+            # One failing shard must not discard the scores of the others
+            return await asyncio.gather(*[run_shard(shard, **shard_kwargs) for shard in shards], return_exceptions=True)
+    
+    results = asyncio.run(run_all())
+    
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if len(errors) == len(results):
+        raise errors[0]
+    
+    frames = []
+    for shard, result in zip(shards, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"Warning: evaluation of a {len(shard)}-row shard failed, scoring it as NaN: {result}")
+            frames.append(pd.DataFrame(index=range(len(shard))))
+        else:
+            frames.append(result.to_pandas())
+    return pd.concat(frames, ignore_index=True)
+
+def evaluate_with_ragas(dataset: "Dataset", azure_llm=None, azure_embeddings=None) -> pd.DataFrame:
     """
     Evaluate the dataset using RAGAS metrics with Azure OpenAI.
     
@@ -78,21 +197,43 @@ def evaluate_with_ragas(dataset: Dataset, azure_llm=None, azure_embeddings=None)
         azure_embeddings: Azure OpenAI embeddings instance (optional)
     
     Returns:
-        Dictionary containing evaluation results
+        DataFrame with per-row evaluation scores, or None if evaluation failed
     """
     
-    # Define metrics to evaluate
+    from ragas.run_config import RunConfig
+    from ragas.metrics import (
+        answer_relevancy,
+        answer_correctness,
+        context_recall,
+        context_precision,
+        faithfulness
+    )
+    
+    # Define metrics to evaluate.
+    # answer_similarity is not listed: answer_correctness already computes it as its
+    # semantic sub-score (answer_correctness.answer_similarity), so listing both
+    # would embed every answer/ground truth pair twice
     metrics = [
         answer_relevancy,      # How relevant is the answer to the question
         answer_correctness,    # How correct is the answer compared to ground truth
-        answer_similarity,     # Semantic similarity between answer and ground truth
         context_recall,        # How much of the ground truth is covered by contexts
         context_precision,     # How precise are the contexts
         faithfulness          # How faithful is the answer to the contexts
     ]
     
+    # Run metric calls concurrently over RAGAS_NUM_SHARDS row shards; RAGAS_MAX_WORKERS
+    # is the total in-flight budget across shards, tuned to the Azure TPM quota
+    num_shards = max(1, int(os.getenv("RAGAS_NUM_SHARDS", "2")))
+    run_config = RunConfig(
+        max_workers=max(1, int(os.getenv("RAGAS_MAX_WORKERS", "32")) // num_shards),
+        timeout=180,
+        max_retries=10,
+        max_wait=60
+    )
+    
     try:
-        print("Starting RAGAS evaluation...")
+        logger.info("Starting RAGAS evaluation...")
+        logger.info("Skipping answer_similarity (covered by answer_correctness's semantic sub-score)")
 
         # Set environment variables for RAGAS to use Azure OpenAI
         if azure_llm and azure_embeddings:
@@ -107,20 +248,20 @@ def evaluate_with_ragas(dataset: Dataset, azure_llm=None, azure_embeddings=None)
             # # Set deployment names
             # os.environ["OPENAI_DEPLOYMENT_NAME"] = os.getenv("AZURE_OPENAI_MODEL_DEPLOYMENT", "gpt-4")
             # os.environ["OPENAI_EMBEDDING_DEPLOYMENT"] = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-ada-002")
-            result = evaluate(dataset, metrics=metrics, llm=azure_llm, embeddings=azure_embeddings)
+            result = run_sharded_evaluation(dataset, metrics, num_shards, llm=azure_llm, embeddings=azure_embeddings, run_config=run_config)
         else:
-            result = evaluate(dataset, metrics=metrics)
+            result = run_sharded_evaluation(dataset, metrics, num_shards, run_config=run_config)
     
         
-        print("RAGAS evaluation completed successfully!")
+        logger.info("RAGAS evaluation completed successfully!")
         return result
         
     except Exception as e:
-        print(f"Error during evaluation: {e}")
+        logger.error(f"Error during evaluation: {e}")
         
         # Try fallback to standard OpenAI if Azure fails
         if azure_llm and azure_embeddings:
-            print("Attempting fallback to standard OpenAI...")
+            logger.info("Attempting fallback to standard OpenAI...")
             try:
                 # Reset environment variables
                 os.environ.pop("OPENAI_API_TYPE", None)
@@ -128,55 +269,83 @@ def evaluate_with_ragas(dataset: Dataset, azure_llm=None, azure_embeddings=None)
                 os.environ.pop("OPENAI_DEPLOYMENT_NAME", None)
                 os.environ.pop("OPENAI_EMBEDDING_DEPLOYMENT", None)
                 
-                result = evaluate(dataset, metrics=metrics)
-                print("RAGAS evaluation completed with fallback OpenAI!")
+                result = run_sharded_evaluation(dataset, metrics, num_shards, run_config=run_config)
+                logger.info("RAGAS evaluation completed with fallback OpenAI!")
                 return result
             except Exception as fallback_error:
-                print(f"Fallback evaluation also failed: {fallback_error}")
+                logger.error(f"Fallback evaluation also failed: {fallback_error}")
                 return None
         else:
             return None
 
-def display_results(result: pd.DataFrame):
-    """Display evaluation results in a formatted way."""
+def downcast_scores(result_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast float score columns to float32.
+    
+    Scores are only reported to 4 decimals, so float32 is plenty and halves the
+    memory traffic of aggregation and the size of the saved results.
+    """
+    
+    float_columns = result_df.select_dtypes('float').columns
+    return result_df.astype({column: np.float32 for column in float_columns})
+
+def display_results(result: pd.DataFrame, categories: pd.Series = None):
+    """
+    Display evaluation results in a formatted way.
+    
+    Args:
+        result: Per-row evaluation scores
+        categories: Categorical category of each row, aligned with result (optional)
+    """
     
     if result is None:
-        print("No results to display.")
+        logger.info("No results to display.")
         return
     
-    print("\n" + "="*60)
-    print("RAGAS EVALUATION RESULTS")
-    print("="*60)
+    logger.info("\n" + "="*60)
+    logger.info("RAGAS EVALUATION RESULTS")
+    logger.info("="*60)
     
     # Overall metrics
-    print("\nOVERALL METRICS:")
-    print("-" * 30)
+    logger.info("\nOVERALL METRICS:")
+    logger.info("-" * 30)
     
     metric_names = {
         'answer_relevancy': 'Answer Relevancy',
         'answer_correctness': 'Answer Correctness',
-        'answer_similarity': 'Answer Similarity', 
         'context_recall': 'Context Recall',
         'context_precision': 'Context Precision',
         'faithfulness': 'Faithfulness'
     }
     
-
-    for metric_key, metric_name in metric_names.items():
-        if metric_key in result:
-            # Get individual scores for this category
-            if hasattr(result, 'to_pandas'):
-                result_df = result.to_pandas()
-                if metric_key in result_df.columns:
-                    category_scores = result_df.iloc[category_indices][metric_key]
-                    avg_score = category_scores.mean()
-                    print(f"  {metric_name:18}: {avg_score:.4f}")
+    # Convert once and reduce all metric columns in a single vectorized call
+    result_df = result.to_pandas() if hasattr(result, 'to_pandas') else result
+    present_metrics = [key for key in metric_names if key in result_df.columns]
+    means = result_df[present_metrics].mean(numeric_only=True).astype(np.float32)
+    
+    for metric_key, avg_score in means.items():
+        logger.info(f"  {metric_names[metric_key]:18}: {avg_score:.4f}")
+    
+    if categories is None:
+        return
+    
+    # Row positions per category, built once for all categories and metrics
+    category_indices = categories.groupby(categories, observed=True).indices
+    metric_scores = result_df[present_metrics]
+    
+    logger.info("\nMETRICS BY CATEGORY:")
+    logger.info("-" * 30)
+    for category, indices in category_indices.items():
+        logger.info(f"\n{category} ({len(indices)} rows)")
+        category_means = metric_scores.iloc[indices].mean(numeric_only=True).astype(np.float32)
+        for metric_key, avg_score in category_means.items():
+            logger.info(f"  {metric_names[metric_key]:18}: {avg_score:.4f}")
 
 def save_detailed_results(result_df: pd.DataFrame, output_path: str):
-    """Save detailed results to CSV file."""
+    """Save detailed results to a Parquet file, or to CSV if output_path ends with .csv."""
     
     if result_df is None:
-        print("No results to save.")
+        logger.info("No results to save.")
         return
     
     try:
@@ -186,22 +355,34 @@ def save_detailed_results(result_df: pd.DataFrame, output_path: str):
         
         # # Save to CSV
         # detailed_df.to_csv(output_path, index=False)
-        result_df.to_csv(output_path, index=False)
-        print(f"Detailed results saved to: {output_path}")
+        if output_path.endswith('.csv'):
+            result_df.to_csv(output_path, index=False)
+        else:
+            # Parquet keeps dtypes and stores scores as binary floats
+            result_df.to_parquet(output_path, index=False, compression='snappy', engine='pyarrow')
+        logger.info(f"Detailed results saved to: {output_path}")
             
     except Exception as e:
-        print(f"Error saving results: {e}")
+        logger.error(f"Error saving results: {e}")
 
 def configure_azure_openai():
     """Configure Azure OpenAI settings for RAGAS evaluation."""
     
+    from cached_embeddings import CachedEmbeddings
+    from retry_after import RetryAfterAzureChatOpenAI, RetryAfterAzureOpenAIEmbeddings
+    
     # Azure OpenAI configuration
     azure_config = {
         "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
         "api_version": os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
         "azure_endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
         "model_deployment": os.getenv("AZURE_OPENAI_MODEL_DEPLOYMENT", "gpt-4"),
-        "embedding_deployment": os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-ada-002")
+        "embedding_deployment": os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-ada-002"),
+        # Number of texts sent per embeddings request (Azure accepts up to 2048; older
+        # deployments that only accept 16 are handled by RetryAfterAzureOpenAIEmbeddings)
+        "embedding_chunk_size": int(os.getenv("AZURE_OPENAI_EMBEDDING_CHUNK_SIZE", "2048")),
+        # Local embedding cache file (set to an empty string to disable)
+        "embedding_cache": os.getenv("RAGAS_EMBEDDING_CACHE", "emb_cache.sqlite")
     }
     
     # Check required environment variables
@@ -209,93 +390,142 @@ def configure_azure_openai():
     missing_vars = [var for var in required_vars if not os.getenv(var)]
     
     if missing_vars:
-        print(f"Error: Missing required environment variables: {', '.join(missing_vars)}")
-        print("Please set the following environment variables:")
-        print("  AZURE_OPENAI_API_KEY=your-azure-openai-api-key")
-        print("  AZURE_OPENAI_ENDPOINT=https://your-resource.openai.azure.com/")
-        print("  AZURE_OPENAI_MODEL_DEPLOYMENT=your-model-deployment-name")
-        print("  AZURE_OPENAI_EMBEDDING_DEPLOYMENT=your-embedding-deployment-name")
+        logger.error(f"Error: Missing required environment variables: {', '.join(missing_vars)}")
+        logger.info("Please set the following environment variables:")
+        logger.info("  AZURE_OPENAI_API_KEY=your-azure-openai-api-key")
+        logger.info("  AZURE_OPENAI_ENDPOINT=https://your-resource.openai.azure.com/")
+        logger.info("  AZURE_OPENAI_MODEL_DEPLOYMENT=your-model-deployment-name")
+        logger.info("  AZURE_OPENAI_EMBEDDING_DEPLOYMENT=your-embedding-deployment-name")
         return None
     
     try:
-        # Create Azure OpenAI LLM
-        azure_llm = AzureChatOpenAI(
+        # Azure OpenAI LLM settings
+        llm_kwargs = dict(
             api_key=azure_config["api_key"],
             api_version=azure_config["api_version"],
             azure_endpoint=azure_config["azure_endpoint"],
             deployment_name=azure_config["model_deployment"],
             model=azure_config["model_deployment"],
-            temperature=0
+            temperature=0,
+            http_client=_HTTP_CLIENT
         )
         
-        # Create Azure OpenAI Embeddings
-        azure_embeddings = AzureOpenAIEmbeddings(
+        # Azure OpenAI Embeddings settings
+        embeddings_kwargs = dict(
             api_key=azure_config["api_key"],
             api_version=azure_config["api_version"],
             azure_endpoint=azure_config["azure_endpoint"],
             deployment=azure_config["embedding_deployment"],
-            model=azure_config["embedding_deployment"]
+            model=azure_config["embedding_deployment"],
+            chunk_size=azure_config["embedding_chunk_size"],
+            http_client=_HTTP_CLIENT
         )
         
-        print("✓ Azure OpenAI configured successfully")
-        print(f"  Endpoint: {azure_config['azure_endpoint']}")
-        print(f"  Model: {azure_config['model_deployment']}")
-        print(f"  Embedding: {azure_config['embedding_deployment']}")
+        # Both clients are independent, so overlap their validation and setup
+        with ThreadPoolExecutor(2) as executor:
+            llm_future = executor.submit(RetryAfterAzureChatOpenAI, **llm_kwargs)
+            embeddings_future = executor.submit(RetryAfterAzureOpenAIEmbeddings, **embeddings_kwargs)
+            azure_llm, azure_embeddings = llm_future.result(), embeddings_future.result()
+        
+        # Reuse vectors for texts embedded in earlier rows or runs
+        if azure_config["embedding_cache"]:
+            azure_embeddings = CachedEmbeddings(
+                azure_embeddings,
+                cache_path=azure_config["embedding_cache"],
+                # Deployment names are only unique per resource, so include the endpoint
+                namespace="|".join([
+                    azure_config["azure_endpoint"],
+                    azure_config["embedding_deployment"],
+                    azure_embeddings.model or "",
+                    azure_config["api_version"]
+                ])
+            )
+        
+        logger.info("✓ Azure OpenAI configured successfully")
+        logger.info(f"  Endpoint: {azure_config['azure_endpoint']}")
+        logger.info(f"  Model: {azure_config['model_deployment']}")
+        logger.info(f"  Embedding: {azure_config['embedding_deployment']}")
+        logger.info(f"  Embedding chunk size: {azure_config['embedding_chunk_size']}")
+        logger.info(f"  Embedding cache: {azure_config['embedding_cache'] or 'disabled'}")
         
         return azure_llm, azure_embeddings
         
     except Exception as e:
-        print(f"Error configuring Azure OpenAI: {e}")
+        logger.error(f"Error configuring Azure OpenAI: {e}")
         return None
 
 def main():
     """Main function to run the RAGAS evaluation."""
     
+    parser = argparse.ArgumentParser(description="Evaluate Q&A data with RAGAS metrics using Azure OpenAI.")
+    parser.add_argument(
+        "csv_path",
+        nargs="?",
+        default="sample_questions_with_answers.csv",
+        help="input CSV with question, answer and reference columns"
+    )
+    parser.add_argument(
+        "--csv",
+        action="store_true",
+        help="save detailed results as CSV instead of Parquet"
+    )
+    args = parser.parse_args()
+    
+    # Only this script's messages are shown; library loggers stay at WARNING
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.INFO)
+    
     # Configuration
-    csv_path = "sample_questions_with_answers.csv"
-    output_path = "ragas_evaluation_results.csv"
+    csv_path = args.csv_path
+    output_path = "ragas_evaluation_results.csv" if args.csv else "ragas_evaluation_results.parquet"
     
-    print("RAGAS Evaluation Script with Azure OpenAI")
-    print("="*40)
+    logger.info("RAGAS Evaluation Script with Azure OpenAI")
+    logger.info("="*40)
+    
+    # Check if input file exists before importing the Azure/RAGAS stack
+    if not os.path.exists(csv_path):
+        logger.error(f"Error: Input file '{csv_path}' not found.")
+        return
     
     # Configure Azure OpenAI
-    print("\nConfiguring Azure OpenAI...")
+    logger.info("\nConfiguring Azure OpenAI...")
     azure_config = configure_azure_openai()
     if azure_config is None:
-        print("Falling back to default OpenAI configuration...")
+        logger.info("Falling back to default OpenAI configuration...")
         azure_llm, azure_embeddings = None, None
     else:
         azure_llm, azure_embeddings = azure_config
     
-    # Check if input file exists
-    if not os.path.exists(csv_path):
-        print(f"Error: Input file '{csv_path}' not found.")
-        return
-    
     # Load data
     df = load_data(csv_path)
     if df is None:
         return
     
-    print(f"Data shape: {df.shape}")
-    print(f"Categories: {df['category'].unique().tolist()}")
+    # Encode categories once; display_results reuses the codes instead of rescanning strings
+    categories = df['category'].astype('category')
+    logger.info(f"Data shape: {df.shape}")
+    logger.info(f"Categories: {categories.cat.categories.tolist()}")
     
-    # Prepare dataset for RAGAS
-    print("\nPreparing dataset for RAGAS evaluation...")
-    dataset = prepare_ragas_dataset(df)
+    # Prepare dataset for RAGAS, evaluating each distinct row only once
+    logger.info("\nPreparing dataset for RAGAS evaluation...")
+    unique_df, row_groups = deduplicate_rows(df)
+    dataset = prepare_ragas_dataset(unique_df)
     
     # Evaluate with RAGAS
-    print(f"dataset shape: {dataset.shape}")
-    result = evaluate_with_ragas(dataset, azure_llm, azure_embeddings).to_pandas()
-    print(f"Evaluation result: {result}")
+    logger.info(f"dataset shape: {dataset.shape}")
+    result = evaluate_with_ragas(dataset, azure_llm, azure_embeddings)
+    if result is not None:
+        # Scatter unique-row scores back to every original row
+        result = downcast_scores(result.iloc[row_groups].reset_index(drop=True))
+    logger.info(f"Evaluation result: {result}")
     
     # Display results
-    # display_results(result, df)
+    display_results(result, categories)
     
     # Save detailed results
     save_detailed_results(result, output_path)
     
-    print(f"\nEvaluation complete!")
+    logger.info("\nEvaluation complete!")
 
 if __name__ == "__main__":
     main()
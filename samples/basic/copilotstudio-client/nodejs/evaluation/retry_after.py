@@ -0,0 +1,162 @@
+"""
+Rate-Limit Aware Azure OpenAI Clients
+
+Azure OpenAI answers throttled requests with HTTP 429 and a Retry-After header.
+The openai SDK already honours that header for its own max_retries attempts; these
+subclasses keep retrying rate limits beyond that budget, sleeping for the advised
+duration or a bounded exponential backoff when the header is missing. The embeddings
+subclass also falls back to 16-input batches on older deployments that reject larger ones.
+"""
+
+import asyncio
+import itertools
+import logging
+import random
+import time
+from typing import Optional
+from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+from openai import BadRequestError, RateLimitError
+from pydantic import model_validator
+
+logger = logging.getLogger(__name__)
+
+# Retries per call before the RateLimitError is raised to the caller
+MAX_RATE_LIMIT_RETRIES = 5
+
+# Upper bound in seconds for the backoff used when no Retry-After header is sent
+MAX_BACKOFF_SECONDS = 30
+
+# Older Azure OpenAI embedding deployments reject batches larger than this
+LEGACY_EMBEDDING_CHUNK_SIZE = 16
+
+def retry_after_seconds(error: RateLimitError) -> Optional[float]:
+    """Return the server-advised wait in seconds, or None if the response has none."""
+    
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        # HTTP-date values are left to the caller's own backoff
+        return None
+    return None
+
+def backoff_seconds(error: RateLimitError, attempt: int) -> float:
+    """Return the advised Retry-After wait, or a jittered exponential backoff without one."""
+    
+    delay = retry_after_seconds(error)
+    if delay is None:
+        delay = min(2 ** attempt, MAX_BACKOFF_SECONDS) * random.uniform(0.5, 1)
+    return delay
+
+def call_with_retry_after(func, *args, **kwargs):
+    """Call func, sleeping for the advised Retry-After (or a backoff) on each rate limit."""
+    
+    for attempt in itertools.count():
+        try:
+            return func(*args, **kwargs)
+        except RateLimitError as e:
+            if attempt >= MAX_RATE_LIMIT_RETRIES:
+                raise
+            time.sleep(backoff_seconds(e, attempt))
+
+async def acall_with_retry_after(func, *args, **kwargs):
+    """Async variant of call_with_retry_after."""
+    
+    for attempt in itertools.count():
+        try:
+            return await func(*args, **kwargs)
+        except RateLimitError as e:
+            if attempt >= MAX_RATE_LIMIT_RETRIES:
+                raise
+            await asyncio.sleep(backoff_seconds(e, attempt))
+
+def is_too_many_inputs(error: BadRequestError) -> bool:
+    """Return True if Azure rejected an embeddings request for having too many inputs."""
+    return "too many inputs" in str(error).lower()
+
+def _response_data(response) -> list:
+    if not isinstance(response, dict):
+        response = response.model_dump()
+    return response["data"]
+
+class _EmbeddingsResource:
+    """
+    Proxy for the openai embeddings resource used by AzureOpenAIEmbeddings.
+    
+    Each request is retried on its own after a rate limit, so chunks
+    that already succeeded are never re-sent. When a request is rejected for
+    having too many inputs, only that request is
+    re-sent in batches of LEGACY_EMBEDDING_CHUNK_SIZE, and the owner's chunk_size
+    is lowered so later requests are batched that way from the start.
+    """
+    
+    def __init__(self, resource, owner: AzureOpenAIEmbeddings):
+        self._resource = resource
+        self._owner = owner
+    
+    def __getattr__(self, name):
+        return getattr(self._resource, name)
+    
+    def _too_many_inputs(self, error: BadRequestError, inputs) -> bool:
+        if not is_too_many_inputs(error) or len(inputs) <= LEGACY_EMBEDDING_CHUNK_SIZE:
+            return False
+        logger.warning(f"Embedding deployment rejected {len(inputs)} inputs per request; "
+                       f"retrying in batches of {LEGACY_EMBEDDING_CHUNK_SIZE}")
+        self._owner.chunk_size = LEGACY_EMBEDDING_CHUNK_SIZE
+        return True
+    
+    def _batches(self, inputs):
+        return [inputs[i:i + LEGACY_EMBEDDING_CHUNK_SIZE] for i in range(0, len(inputs), LEGACY_EMBEDDING_CHUNK_SIZE)]
+    
+    def create(self, *, input, **kwargs):
+        try:
+            return call_with_retry_after(self._resource.create, input=input, **kwargs)
+        except BadRequestError as e:
+            if not self._too_many_inputs(e, input):
+                raise
+        data = []
+        for batch in self._batches(input):
+            data.extend(_response_data(call_with_retry_after(self._resource.create, input=batch, **kwargs)))
+        return {"data": data}
+
+class _AsyncEmbeddingsResource(_EmbeddingsResource):
+    """Async variant of _EmbeddingsResource."""
+    
+    async def create(self, *, input, **kwargs):
+        try:
+            return await acall_with_retry_after(self._resource.create, input=input, **kwargs)
+        except BadRequestError as e:
+            if not self._too_many_inputs(e, input):
+                raise
+        data = []
+        for batch in self._batches(input):
+            data.extend(_response_data(await acall_with_retry_after(self._resource.create, input=batch, **kwargs)))
+        return {"data": data}
+
+class RetryAfterAzureChatOpenAI(AzureChatOpenAI):
+    """AzureChatOpenAI that honours Retry-After on rate limits."""
+    
+    def _generate(self, *args, **kwargs):
+        return call_with_retry_after(super()._generate, *args, **kwargs)
+    
+    async def _agenerate(self, *args, **kwargs):
+        return await acall_with_retry_after(super()._agenerate, *args, **kwargs)
+
+class RetryAfterAzureOpenAIEmbeddings(AzureOpenAIEmbeddings):
+    """AzureOpenAIEmbeddings that honours Retry-After and caps batches on older deployments."""
+    
+    @model_validator(mode="after")
+    def _wrap_embeddings_clients(self):
+        # Runs after AzureOpenAIEmbeddings has created its openai clients
+        if self.client is not None and not isinstance(self.client, _EmbeddingsResource):
+            self.client = _EmbeddingsResource(self.client, self)
+        if self.async_client is not None and not isinstance(self.async_client, _EmbeddingsResource):
+            self.async_client = _AsyncEmbeddingsResource(self.async_client, self)
+        return self
@@ -6,70 +6,126 @@ This script tests the Azure OpenAI configuration for RAGAS evaluation.
 """
 
 import os
-from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+import atexit
+import logging
+import argparse
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import httpx
+from retry_after import RetryAfterAzureChatOpenAI, RetryAfterAzureOpenAIEmbeddings
 
-def test_azure_openai_config():
-    """Test Azure OpenAI configuration."""
+logger = logging.getLogger(__name__)
+
+# Shared connection pool so LLM and embedding calls reuse warm keep-alive connections
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_HTTP_CLIENT = httpx.Client(limits=_HTTP_LIMITS, http2=True, timeout=60)
+atexit.register(_HTTP_CLIENT.close)
+
+def check_endpoint_reachable(endpoint: str, timeout: float = 2.0) -> bool:
+    """Check that the endpoint host resolves and accepts a TCP connection."""
+    
+    parsed = urlparse(endpoint)
+    host = parsed.hostname
+    if not host:
+        logger.error(f"❌ Invalid endpoint URL: {endpoint}")
+        return False
+    
+    port = parsed.port or (80 if parsed.scheme == "http" else 443)
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+    except OSError as e:
+        logger.error(f"❌ Cannot reach {host}:{port}: {e}")
+        return False
+    
+    logger.info(f"✅ Endpoint reachable: {host}:{port}")
+    return True
+
+def test_azure_openai_config(deep: bool = False):
+    """
+    Test Azure OpenAI configuration.
+    
+    By default only the endpoint reachability and client construction are checked.
+    With deep=True a chat completion and an embedding request are also sent.
+    """
     
-    print("Testing Azure OpenAI Configuration")
-    print("=" * 40)
+    logger.info("Testing Azure OpenAI Configuration")
+    logger.info("=" * 40)
     
     # Check environment variables
     required_vars = ["AZURE_OPENAI_API_KEY", "AZURE_OPENAI_ENDPOINT"]
     missing_vars = [var for var in required_vars if not os.getenv(var)]
     
     if missing_vars:
-        print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
+        logger.error(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
         return False
     
     # Print configuration
-    print("Configuration:")
-    print(f"  Endpoint: {os.getenv('AZURE_OPENAI_ENDPOINT')}")
-    print(f"  API Version: {os.getenv('AZURE_OPENAI_API_VERSION', '2024-02-01')}")
-    print(f"  Model Deployment: {os.getenv('AZURE_OPENAI_MODEL_DEPLOYMENT', 'gpt-4')}")
-    print(f"  Embedding Deployment: {os.getenv('AZURE_OPENAI_EMBEDDING_DEPLOYMENT', 'text-embedding-ada-002')}")
+    logger.info("Configuration:")
+    logger.info(f"  Endpoint: {os.getenv('AZURE_OPENAI_ENDPOINT')}")
+    logger.info(f"  API Version: {os.getenv('AZURE_OPENAI_API_VERSION', '2024-02-01')}")
+    logger.info(f"  Model Deployment: {os.getenv('AZURE_OPENAI_MODEL_DEPLOYMENT', 'gpt-4')}")
+    logger.info(f"  Embedding Deployment: {os.getenv('AZURE_OPENAI_EMBEDDING_DEPLOYMENT', 'text-embedding-ada-002')}")
+    logger.info(f"  Embedding Chunk Size: {os.getenv('AZURE_OPENAI_EMBEDDING_CHUNK_SIZE', '2048')}")
+    
+    # Cheap DNS + TCP probe before paying for any API round-trip
+    logger.info("\n🔄 Checking Azure OpenAI endpoint...")
+    if not check_endpoint_reachable(os.getenv("AZURE_OPENAI_ENDPOINT")):
+        return False
     
     try:
-        # Test LLM
-        print("\n🔄 Testing Azure OpenAI LLM...")
-        azure_llm = AzureChatOpenAI(
+        # Create LLM and Embeddings clients
+        logger.info("\n🔄 Creating Azure OpenAI clients...")
+        azure_llm = RetryAfterAzureChatOpenAI(
             api_key=os.getenv("AZURE_OPENAI_API_KEY"),
             api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
             azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
             deployment_name=os.getenv("AZURE_OPENAI_MODEL_DEPLOYMENT", "gpt-4"),
-            temperature=0
+            temperature=0,
+            http_client=_HTTP_CLIENT
         )
-        
-        # Simple test
-        response = azure_llm.invoke("Hello, how are you?")
-        print(f"✅ LLM Response: {response.content[:100]}...")
-        
-        # Test Embeddings
-        print("\n🔄 Testing Azure OpenAI Embeddings...")
-        azure_embeddings = AzureOpenAIEmbeddings(
+        azure_embeddings = RetryAfterAzureOpenAIEmbeddings(
             api_key=os.getenv("AZURE_OPENAI_API_KEY"),
             api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
             azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-            deployment=os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-ada-002")
+            deployment=os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-ada-002"),
+            chunk_size=int(os.getenv("AZURE_OPENAI_EMBEDDING_CHUNK_SIZE", "2048")),
+            http_client=_HTTP_CLIENT
         )
+        logger.info("✅ Azure OpenAI clients created")
+        
+        if not deep:
+            logger.info("\n✅ Azure OpenAI configuration test passed! (run with --deep to call the API)")
+            return True
         
-        # Simple embedding test
-        embedding = azure_embeddings.embed_query("Hello world")
-        print(f"✅ Embedding dimension: {len(embedding)}")
+        # Test LLM and Embeddings concurrently; the requests are independent
+        logger.info("\n🔄 Testing Azure OpenAI LLM and Embeddings...")
+        with ThreadPoolExecutor(2) as executor:
+            llm_future = executor.submit(azure_llm.invoke, "Hello, how are you?")
+            embedding_future = executor.submit(azure_embeddings.embed_query, "Hello world")
+            response, embedding = llm_future.result(), embedding_future.result()
         
-        print("\n✅ Azure OpenAI configuration test passed!")
+        logger.info(f"✅ LLM Response: {response.content[:100]}...")
+        logger.info(f"✅ Embedding dimension: {len(embedding)}")
+        
+        logger.info("\n✅ Azure OpenAI configuration test passed!")
         return True
         
     except Exception as e:
-        print(f"\n❌ Azure OpenAI configuration test failed: {e}")
+        logger.error(f"\n❌ Azure OpenAI configuration test failed: {e}")
         return False
 
+def mask_secret(value: str) -> str:
+    """Mask a secret, keeping only its first 8 and last 4 characters."""
+    return value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
+
 def test_environment_variables():
     """Test if all required environment variables are set."""
     
-    print("\n" + "=" * 40)
-    print("Environment Variables Check")
-    print("=" * 40)
+    logger.info("\n" + "=" * 40)
+    logger.info("Environment Variables Check")
+    logger.info("=" * 40)
     
     # Azure OpenAI variables
     azure_vars = {
@@ -83,41 +139,58 @@ def test_environment_variables():
     for var, description in azure_vars.items():
         value = os.getenv(var)
         if value:
-            # Mask API key for security
+            # Only show the masked API key at debug level
             if "API_KEY" in var:
-                masked_value = value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
-                print(f"✅ {description}: {masked_value}")
+                logger.info(f"✅ {description}: set")
+                logger.debug(f"   {description}: {mask_secret(value)}")
             else:
-                print(f"✅ {description}: {value}")
+                logger.info(f"✅ {description}: {value}")
         else:
-            print(f"❌ {description}: Not set")
+            logger.warning(f"❌ {description}: Not set")
     
     # OpenAI fallback
     openai_key = os.getenv("OPENAI_API_KEY")
     if openai_key:
-        masked_key = openai_key[:8] + "..." + openai_key[-4:] if len(openai_key) > 12 else "***"
-        print(f"✅ OpenAI API Key (fallback): {masked_key}")
+        logger.info("✅ OpenAI API Key (fallback): set")
+        logger.debug(f"   OpenAI API Key (fallback): {mask_secret(openai_key)}")
     else:
-        print(f"⚠️ OpenAI API Key (fallback): Not set")
+        logger.warning("⚠️ OpenAI API Key (fallback): Not set")
 
 def main():
     """Main function."""
     
+    parser = argparse.ArgumentParser(description="Test the Azure OpenAI configuration for RAGAS evaluation.")
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="also send a chat completion and an embedding request (costs tokens)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="also show masked API keys"
+    )
+    args = parser.parse_args()
+    
+    # Only this script's messages are shown; library loggers stay at WARNING
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    
     # Test environment variables
     test_environment_variables()
     
     # Test Azure OpenAI configuration
-    success = test_azure_openai_config()
+    success = test_azure_openai_config(deep=args.deep)
     
     if success:
-        print("\n🎉 All tests passed! Ready to run RAGAS evaluation.")
+        logger.info("\n🎉 All tests passed! Ready to run RAGAS evaluation.")
     else:
-        print("\n💡 Please check your Azure OpenAI configuration.")
-        print("   Make sure the following environment variables are set:")
-        print("   - AZURE_OPENAI_API_KEY")
-        print("   - AZURE_OPENAI_ENDPOINT")
-        print("   - AZURE_OPENAI_MODEL_DEPLOYMENT")
-        print("   - AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+        logger.info("\n💡 Please check your Azure OpenAI configuration.")
+        logger.info("   Make sure the following environment variables are set:")
+        logger.info("   - AZURE_OPENAI_API_KEY")
+        logger.info("   - AZURE_OPENAI_ENDPOINT")
+        logger.info("   - AZURE_OPENAI_MODEL_DEPLOYMENT")
+        logger.info("   - AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
 
 if __name__ == "__main__":
     main()